@@ -1,14 +1,58 @@
 from abc import ABC, abstractmethod
+import asyncio
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Dict, Any
 from .utils import log
-import time
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
 
 class BaseScout(ABC):
     def __init__(self):
         self.session = requests.Session()
+
+        # Reuse pooled keep-alive connections and retry transient 5xx
+        # responses instead of paying a TCP+TLS handshake per attempt
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=4,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers["Connection"] = "keep-alive"
+        self.session.headers["User-Agent"] = USER_AGENT
+        # urllib3 decodes Brotli transparently when the brotli package
+        # is installed; br typically shaves ~20% off gzip on these pages
+        self.session.headers["Accept-Encoding"] = "br, gzip, deflate"
+
+        # Set from a signal handler (or another thread) to wake a
+        # sleeping scout and stop its run loop. The asyncio event and
+        # loop reference are filled in by run_async so stop() can also
+        # wake a sleep_async that is pending on the event loop.
+        self._stop = threading.Event()
+        self._stop_async = None
+        self._loop = None
+
+        # Run counter lives in memory; it is flushed to disk every few
+        # runs and on stop() instead of on every iteration
+        self._run_number = 0
+
         self.setup()
 
+    def stop(self):
+        """Request the run loop to exit, waking any pending sleep"""
+        self._stop.set()
+        if self._loop is not None and self._stop_async is not None:
+            self._loop.call_soon_threadsafe(self._stop_async.set)
+        if self._run_number:
+            self.save_run_number(self._run_number)
+
     def setup(self):
         """Initialize scout with configuration"""
         pass
@@ -37,9 +81,11 @@ class BaseScout(ABC):
         """
         run_number = self.load_run_number()
 
-        while True:
+        while not self._stop.is_set():
             run_number += 1
-            self.save_run_number(run_number)
+            self._run_number = run_number
+            if run_number % 10 == 0:
+                self.save_run_number(run_number)
 
             start_message = f"🚀 Starting run #{run_number}"
 
@@ -63,6 +109,8 @@ class BaseScout(ABC):
                     self.notify(f"⚠️ Error during search (attempt #{attempt}):\n`{e}`")
 
                 self.sleep(short_wait)
+                if self._stop.is_set():
+                    return
 
             if results:
                 self.handle_success(run_number, results)
@@ -71,12 +119,84 @@ class BaseScout(ABC):
                 self.handle_failure(run_number, max_attempts)
                 self.sleep(long_wait)
 
+    async def run_async(self, max_attempts: int = 5, short_wait: int = 60, long_wait: int = 3600):
+        """
+        Async variant of run() for hosting several scouts on one event loop
+        via asyncio.gather(). Waits use asyncio.sleep and the blocking HTTP
+        work runs in a worker thread, so scouts never block each other.
+        Args:
+            max_attempts: Maximum attempts per run
+            short_wait: Seconds between attempts
+            long_wait: Seconds between runs when successful
+        """
+        self._loop = asyncio.get_running_loop()
+        self._stop_async = asyncio.Event()
+        if self._stop.is_set():
+            self._stop_async.set()
+
+        run_number = self.load_run_number()
+
+        while not self._stop.is_set():
+            run_number += 1
+            self._run_number = run_number
+            if run_number % 10 == 0:
+                self.save_run_number(run_number)
+
+            start_message = f"🚀 Starting run #{run_number}"
+
+            log(start_message)
+            await asyncio.to_thread(self.notify, start_message)
+
+            attempt = 0
+            results = None
+
+            while attempt < max_attempts and not results:
+                attempt += 1
+                try:
+                    search_results = await asyncio.to_thread(self.perform_search)
+                    parsed = self.parse_results(search_results)
+                    if parsed.get("success", False):
+                        results = parsed
+                        break
+                except Exception as e:
+                    error_msg = f"[Attempt #{attempt}] Error during search: {e}"
+                    log(error_msg)
+                    await asyncio.to_thread(
+                        self.notify, f"⚠️ Error during search (attempt #{attempt}):\n`{e}`"
+                    )
+
+                await self.sleep_async(short_wait)
+                if self._stop.is_set():
+                    return
+
+            # Notifications are blocking HTTP calls too, so keep them off
+            # the event loop just like perform_search
+            if results:
+                await asyncio.to_thread(self.handle_success, run_number, results)
+                await self.sleep_async(long_wait)
+            else:
+                await asyncio.to_thread(self.handle_failure, run_number, max_attempts)
+                await self.sleep_async(long_wait)
+
     def sleep(self, seconds: float):
-        """Sleep with random jitter"""
+        """Sleep with random jitter, waking early when stop() is called"""
+        from .utils import random_delay
+        delay = random_delay(seconds)
+        log(f"Waiting {delay:.1f} seconds...")
+        self._stop.wait(delay)
+
+    async def sleep_async(self, seconds: float):
+        """Sleep with random jitter, waking early when stop() is called"""
         from .utils import random_delay
         delay = random_delay(seconds)
         log(f"Waiting {delay:.1f} seconds...")
-        time.sleep(delay)
+        if self._stop_async is None:
+            await asyncio.sleep(delay)
+            return
+        try:
+            await asyncio.wait_for(self._stop_async.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
 
     def load_run_number(self) -> int:
         """Load the current run number"""
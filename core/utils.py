@@ -1,12 +1,28 @@
+import json
 import os
 import random
 import logging
+import time
 from typing import Dict, Any
 
-import requests
-
 from core.exceptions import ScoutConfigurationError
 
+# Shared session for api.telegram.org so notifications reuse one TLS
+# connection instead of handshaking per message; built lazily so
+# importing this module stays cheap
+_TG_SESSION = None
+
+
+def _get_tg_session():
+    """Create the pooled Telegram session on first use"""
+    global _TG_SESSION
+    if _TG_SESSION is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        _TG_SESSION = requests.Session()
+        _TG_SESSION.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=4))
+    return _TG_SESSION
+
 
 def setup_logging():
     """Configure basic logging"""
@@ -44,9 +60,11 @@ def random_delay(base_seconds: float) -> float:
 
 
 def save_run_number(run_num: int, file_path: str = "run_number.txt"):
-    """Persist run number to file"""
-    with open(file_path, "w") as f:
+    """Persist run number to file via an atomic replace"""
+    tmp_path = file_path + ".tmp"
+    with open(tmp_path, "w") as f:
         f.write(str(run_num))
+    os.replace(tmp_path, file_path)
 
 
 def load_run_number(file_path: str = "run_number.txt") -> int:
@@ -58,6 +76,23 @@ def load_run_number(file_path: str = "run_number.txt") -> int:
         return 0
 
 
+def save_viewstate(hidden_inputs: Dict[str, str], file_path: str = "viewstate.json"):
+    """Persist cached ASP.NET hidden form fields across runs"""
+    with open(file_path, "w") as f:
+        json.dump(hidden_inputs, f)
+
+
+def load_viewstate(file_path: str = "viewstate.json", max_age_seconds: int = 1800):
+    """Load cached hidden form fields; returns None if missing or stale"""
+    try:
+        if time.time() - os.path.getmtime(file_path) > max_age_seconds:
+            return None
+        with open(file_path, "r") as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+
 def send_telegram_message(bot_token: str, chat_id: str, text: str):
     """Send message via Telegram
 
@@ -73,7 +108,7 @@ def send_telegram_message(bot_token: str, chat_id: str, text: str):
         "parse_mode": "Markdown"
     }
     try:
-        response = requests.post(url, json=payload)
+        response = _get_tg_session().post(url, json=payload, timeout=10)
         if not response.ok:
             log(f"Telegram API error: {response.status_code} {response.text}")
     except Exception as e:
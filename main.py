@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
 import argparse
+import asyncio
+import signal
 from scouts.vhs_berlin import VHSBerlinScout
 
 
@@ -14,7 +16,15 @@ def main():
 
     if args.command == 'vhs-berlin':
         scout = VHSBerlinScout()
-        scout.run()
+
+        # Wake any sleeping scout immediately on SIGTERM/SIGINT so the
+        # process shuts down without waiting out a long_wait
+        signal.signal(signal.SIGTERM, lambda signum, frame: scout.stop())
+        signal.signal(signal.SIGINT, lambda signum, frame: scout.stop())
+
+        # Single scout today, but run_async lets several scouts share
+        # one event loop via asyncio.gather()
+        asyncio.run(scout.run_async())
 
 
 if __name__ == '__main__':
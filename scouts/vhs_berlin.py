@@ -1,10 +1,23 @@
 import os
 import re
+import time
+import urllib.parse
 from typing import Dict, Any
-from bs4 import BeautifulSoup
 from core.base_scout import BaseScout
-from core.utils import log, load_env_vars, send_telegram_message
+from core.utils import log, load_env_vars, send_telegram_message, save_viewstate, load_viewstate
 
+_DIGITS_RE = re.compile(r"\d+")
+
+# Hidden fields older than this are revalidated before the POST-first
+# path trusts them; matches the load_viewstate staleness cutoff
+_HIDDEN_MAX_AGE = 1800
+
+# ASP.NET hidden form fields echoed back on every search POST
+_HIDDEN_FIELD_NAMES = (
+    "__VIEWSTATE", "__VIEWSTATEGENERATOR", "__LASTFOCUS",
+    "__EVENTTARGET", "__EVENTARGUMENT", "__SCROLLPOSITIONX",
+    "__SCROLLPOSITIONY",
+)
 
 class VHSBerlinScout(BaseScout):
     def setup(self):
@@ -23,50 +36,16 @@ class VHSBerlinScout(BaseScout):
             "MAX_ATTEMPTS": int(os.getenv("MAX_ATTEMPTS", "500"))
         })
 
-    def notify(self, message: str):
-        """Send notification via Telegram"""
-        send_telegram_message(self.config['TELEGRAM_BOT_TOKEN'], self.config['TELEGRAM_CHAT_ID'], message)
+        # Cache validators from the last successful GET so unchanged pages
+        # can be answered with a 304 instead of a full download + parse
+        self._etag = None
+        self._last_mod = None
+        self._cached_hidden = None
+        self._cached_hidden_ts = 0.0
 
-    def perform_search(self) -> Any:
-        """Perform the VHS Berlin course search"""
-        # Step 1: Initial GET to get cookies + hidden fields
-        r = self.session.get(self.config["URL"])
-        r.raise_for_status()
-        soup = BeautifulSoup(r.text, "html.parser")
-        hidden_inputs = self._get_hidden_inputs(soup)
-
-        # Step 2: Prepare payload for POST
-        payload = self._build_search_payload(hidden_inputs)
-
-        # Step 3: POST request (form submit)
-        post_resp = self.session.post(self.config["URL"], data=payload, allow_redirects=False)
-        if post_resp.status_code not in [302, 200]:
-            raise Exception(f"Unexpected POST response status: {post_resp.status_code}")
-
-        # Step 4: Follow redirects if needed
-        content = self._follow_redirects(post_resp)
-        return content
-
-    def _get_hidden_inputs(self, soup: BeautifulSoup) -> Dict[str, str]:
-        """Extract hidden form inputs"""
-        inputs = {}
-        for name in ["__VIEWSTATE", "__VIEWSTATEGENERATOR", "__LASTFOCUS",
-                     "__EVENTTARGET", "__EVENTARGUMENT", "__SCROLLPOSITIONX",
-                     "__SCROLLPOSITIONY"]:
-            tag = soup.find("input", {"name": name})
-            inputs[name] = tag["value"] if tag else ""
-        return inputs
-
-    def _build_search_payload(self, hidden_inputs: Dict[str, str]) -> Dict[str, str]:
-        """Build the search form payload"""
-        return {
-            "__LASTFOCUS": hidden_inputs["__LASTFOCUS"],
-            "__EVENTTARGET": hidden_inputs["__EVENTTARGET"],
-            "__EVENTARGUMENT": hidden_inputs["__EVENTARGUMENT"],
-            "__VIEWSTATE": hidden_inputs["__VIEWSTATE"],
-            "__VIEWSTATEGENERATOR": hidden_inputs["__VIEWSTATEGENERATOR"],
-            "__SCROLLPOSITIONX": hidden_inputs["__SCROLLPOSITIONX"],
-            "__SCROLLPOSITIONY": hidden_inputs["__SCROLLPOSITIONY"],
+        # Static part of the search form; only the hidden ASP.NET fields
+        # change between attempts
+        self._base_payload = {
             "ctl00$Content$btnSearch": "Suchen",
             "ctl00$Content$SimpleSearch1$SimpleSearchBox$txtSearchTerm": "",
             "ctl00$Content$KeywordsList1$cmbKeyword": self.config["KEYWORD_SELECTION_VALUE"],
@@ -81,67 +60,146 @@ class VHSBerlinScout(BaseScout):
             "ctl00$Content$TimeDependingInput1$txtEndTo": "",
             "ctl00$Content$CourseNumber1$searchBoxCourseNr$txtSearchTerm": ""
         }
+        # The static fields never change, so urlencode them once; each
+        # POST only encodes the hidden ASP.NET fields
+        self._static_body = urllib.parse.urlencode(self._base_payload).encode()
+
+    def notify(self, message: str):
+        """Send notification via Telegram"""
+        send_telegram_message(self.config['TELEGRAM_BOT_TOKEN'], self.config['TELEGRAM_CHAT_ID'], message)
+
+    def perform_search(self) -> Any:
+        """Perform the VHS Berlin course search"""
+        # The hidden ASP.NET fields are effectively static between polls,
+        # so try the POST directly with cached ones and only fall back to
+        # the GET when the server rejects them. The in-memory copy goes
+        # stale after the same cutoff as the disk cache; the dict itself
+        # is kept so _fetch_hidden_inputs can revalidate it with a 304.
+        hidden_inputs = self._cached_hidden
+        if hidden_inputs is not None and time.time() - self._cached_hidden_ts > _HIDDEN_MAX_AGE:
+            hidden_inputs = None
+        if hidden_inputs is None:
+            hidden_inputs = load_viewstate()
+            if hidden_inputs:
+                self._cached_hidden = hidden_inputs
+                self._cached_hidden_ts = time.time()
+        if hidden_inputs:
+            post_resp = self._submit_search(hidden_inputs)
+            if post_resp.ok and self._looks_like_results(post_resp.text):
+                return post_resp.text
+            # Cached fields rejected (error page, or the search form
+            # served back); drop them and the GET validators
+            self._cached_hidden = None
+            self._etag = None
+            self._last_mod = None
+
+        hidden_inputs = self._fetch_hidden_inputs()
+        post_resp = self._submit_search(hidden_inputs)
+        if not post_resp.ok:
+            raise Exception(f"Unexpected POST response status: {post_resp.status_code}")
+        return post_resp.text
 
-    def _follow_redirects(self, initial_response) -> Any:
-        """Follow redirect chain if needed"""
-        # First response handling
-        if initial_response.status_code == 200:
-            return initial_response.text
+    def _fetch_hidden_inputs(self) -> Dict[str, str]:
+        """GET the search page and extract + cache the hidden form fields.
 
-        loc = initial_response.headers.get("Location")
-        if not loc:
-            return initial_response.text
+        Sends cached validators so an unchanged page comes back as a 304.
+        """
+        # Only send validators when there is a cached dict to reuse on a
+        # 304; a 304 body is empty and must never be parsed for fields
+        headers = {}
+        if self._cached_hidden is not None:
+            if self._etag:
+                headers["If-None-Match"] = self._etag
+            if self._last_mod:
+                headers["If-Modified-Since"] = self._last_mod
 
-        # First redirect
-        r1 = self.session.get(f"https://www.vhsit.berlin.de{loc}", allow_redirects=False)
-        if r1.status_code == 200:
-            return r1.text
+        # selectolax is imported lazily so CLI paths that never parse stay fast
+        from selectolax.parser import HTMLParser
+
+        r = self.session.get(self.config["URL"], headers=headers)
+        if r.status_code == 304:
+            if self._cached_hidden is not None:
+                # Page unchanged, so the cached fields are still valid
+                self._cached_hidden_ts = time.time()
+                return self._cached_hidden
+            # Stray 304 with nothing cached; re-GET unconditionally
+            r = self.session.get(self.config["URL"])
+
+        r.raise_for_status()
+        hidden_inputs = self._get_hidden_inputs(HTMLParser(r.text))
 
-        loc2 = r1.headers.get("Location")
-        if not loc2:
-            return r1.text
+        self._cached_hidden = hidden_inputs
+        self._cached_hidden_ts = time.time()
+        save_viewstate(hidden_inputs)
 
-        # Second redirect
-        r2 = self.session.get(f"https://www.vhsit.berlin.de{loc2}")
-        r2.raise_for_status()
-        return r2.text
+        # ASP.NET may send Cache-Control: no-store; don't cache validators then
+        if "no-store" not in r.headers.get("Cache-Control", ""):
+            self._etag = r.headers.get("ETag")
+            self._last_mod = r.headers.get("Last-Modified")
+        return hidden_inputs
+
+    def _submit_search(self, hidden_inputs: Dict[str, str]):
+        """POST the search form; requests follows the redirect chain
+        on the pooled connection for us"""
+        return self.session.post(
+            self.config["URL"],
+            data=self._build_search_payload(hidden_inputs),
+            headers={"Content-Type": "application/x-www-form-urlencoded"}
+        )
+
+    @staticmethod
+    def _looks_like_results(html_text: str) -> bool:
+        """Check that a POST response is a recognizable results page.
+
+        ViewState rejections come in several shapes (localized error
+        pages, the search form served back); anything without the
+        markers parse_results relies on means the cached fields failed.
+        """
+        return ("Zu Ihrer Suche wurden keine Kurse gefunden." in html_text
+                or "Kursliste" in html_text)
+
+    def _get_hidden_inputs(self, tree: "HTMLParser") -> Dict[str, str]:
+        """Extract hidden form inputs in a single pass over the <input> tags"""
+        inputs = dict.fromkeys(_HIDDEN_FIELD_NAMES, "")
+        for tag in tree.css("input"):
+            name = tag.attributes.get("name")
+            if name in inputs:
+                inputs[name] = tag.attributes.get("value") or ""
+        return inputs
+
+    def _build_search_payload(self, hidden_inputs: Dict[str, str]) -> bytes:
+        """Append the urlencoded hidden fields to the precomputed static body"""
+        return self._static_body + b"&" + urllib.parse.urlencode(hidden_inputs).encode()
 
     def parse_results(self, html_text: str) -> Dict[str, Any]:
         """Parse the HTML results from VHS Berlin"""
-        soup = BeautifulSoup(html_text, "html.parser")
+        from selectolax.parser import HTMLParser
+
+        tree = HTMLParser(html_text)
+
+        def label_text(el_id):
+            el = tree.css_first(f"#{el_id}")
+            return el.text() if el else ""
 
         # Check for no courses found
-        error_el = soup.select_one("#ctl00_Content_ErrorMessage1_lblError")
-        if error_el and "Zu Ihrer Suche wurden keine Kurse gefunden." in error_el.text:
+        if "Zu Ihrer Suche wurden keine Kurse gefunden." in label_text("ctl00_Content_ErrorMessage1_lblError"):
             return {"success": False, "has_courses": False}
 
         # Check for course list title
-        title_el = soup.select_one("#ctl00_Content_lblTitle")
-        if not title_el or "Kursliste" not in title_el.text:
+        if "Kursliste" not in label_text("ctl00_Content_lblTitle"):
             return {"success": False, "has_courses": False}
 
         # Get course count
-        count_el = soup.select_one("#ctl00_Content_lblMessage1All")
-        count_text = count_el.text.strip() if count_el else ""
-        m = re.search(r"\d+", count_text)
+        m = _DIGITS_RE.search(label_text("ctl00_Content_lblMessage1All"))
         course_count = int(m.group()) if m else 0
 
-        # Parse course rows
-        rows = soup.select("#ctl00_Content_ILDataGrid1 tr.DataGridItem")
-        courses = []
-        for row in rows:
-            def safe_text(sel):
-                try:
-                    el = row.select_one(sel)
-                    return el.text.strip() if el else "N/A"
-                except:
-                    return "N/A"
-
-            courses.append({
-                "district": safe_text("td.DataGridItemDistrict"),
-                "course_title": safe_text("td.DataGridItemCourseTitle"),
-                "free_places": safe_text("td.DataGridItemPlaces")
-            })
+        # Parse course rows: one CSS query per column zipped into row
+        # tuples instead of allocating a dict per row
+        row_sel = "#ctl00_Content_ILDataGrid1 tr.DataGridItem td."
+        districts = [el.text(strip=True) for el in tree.css(row_sel + "DataGridItemDistrict")]
+        titles = [el.text(strip=True) for el in tree.css(row_sel + "DataGridItemCourseTitle")]
+        places = [el.text(strip=True) for el in tree.css(row_sel + "DataGridItemPlaces")]
+        courses = list(zip(districts, titles, places))
 
         return {
             "success": True,
@@ -158,14 +216,24 @@ class VHSBerlinScout(BaseScout):
             f"Link: {self.config['URL']}\n\n"
         )
 
-        for i, c in enumerate(results["courses"], 1):
+        for i, (district, title, free_places) in enumerate(results["courses"], 1):
             message += (
-                f"{i}. District: {c['district']}\n"
-                f"   Title: {c['course_title']}\n"
-                f"   Free places: {c['free_places']}\n\n"
+                f"{i}. District: {district}\n"
+                f"   Title: {title}\n"
+                f"   Free places: {free_places}\n\n"
             )
 
-        self.notify(message)
+        # Telegram caps messages at 4096 chars; split long course lists on
+        # the blank lines between entries so Markdown entities are never
+        # cut mid-chunk, and send the chunks over the pooled connection
+        chunk = ""
+        for block in message.split("\n\n"):
+            if chunk and len(chunk) + len(block) + 2 > 4000:
+                self.notify(chunk.rstrip())
+                chunk = ""
+            chunk += block + "\n\n"
+        if chunk.strip():
+            self.notify(chunk.rstrip())
         log(f"Courses found on run #{run_number}, waiting {self.config['LONG_WAIT'] / 60:.1f} minutes before next run...")
 
     def handle_failure(self, run_number: int, max_attempts: int):
@@ -180,4 +248,12 @@ class VHSBerlinScout(BaseScout):
             max_attempts=self.config["MAX_ATTEMPTS"],
             short_wait=self.config["SHORT_WAIT"],
             long_wait=self.config["LONG_WAIT"]
-        )
\ No newline at end of file
+        )
+
+    async def run_async(self):
+        """Async run with VHS Berlin specific configuration"""
+        await super().run_async(
+            max_attempts=self.config["MAX_ATTEMPTS"],
+            short_wait=self.config["SHORT_WAIT"],
+            long_wait=self.config["LONG_WAIT"]
+        )